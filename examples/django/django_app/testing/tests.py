@@ -1,6 +1,24 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+from django.contrib.auth.models import Group, User
 from django.test import TestCase
 
-# Create your tests here.
+from .models import users_with_groups
+
+
+class UsersWithGroupsTest(TestCase):
+    def setUp(self):
+        group = Group.objects.create(name="testing")
+        for i in range(3):
+            User.objects.create_user(username=f"user{i}", password="password").groups.add(group)
+
+    def test_groups_are_prefetched(self):
+        with self.assertNumQueries(2):
+            groups = [[g.name for g in user.groups.all()] for user in users_with_groups()]
+        self.assertEqual(groups, [["testing"]] * 3)
+
+    def test_login_runs_a_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/login", {"username": "user0", "password": "password"})
+        self.assertEqual(response.status_code, 200)
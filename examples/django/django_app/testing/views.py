@@ -4,29 +4,70 @@
 import os
 import time
 
+import orjson
 from django.conf import settings
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
-from django.http import HttpResponse, JsonResponse
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseBadRequest
+
+# The environment of a worker never changes after start, serialize it only once.
+ENVIRON_JSON = orjson.dumps(dict(os.environ))
+
+# Settings are fixed once the worker has started.
+SETTINGS = {name: getattr(settings, name) for name in dir(settings) if name.isupper()}
+
+USER_COUNT_CACHE_KEY = "user_count"
+# Users created outside of this worker (e.g. by manage.py) show up after at most this delay.
+USER_COUNT_CACHE_TIMEOUT = 5
+
+
+class OrjsonResponse(HttpResponse):
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault("content_type", "application/json")
+        # Fall back to the encoder JsonResponse uses for the types orjson doesn't know about and
+        # accept non-string dict keys as the json module does.
+        content = orjson.dumps(
+            data, default=DjangoJSONEncoder().default, option=orjson.OPT_NON_STR_KEYS
+        )
+        super().__init__(content=content, **kwargs)
 
 
 def environ(request):
-    return JsonResponse(dict(os.environ))
+    return HttpResponse(ENVIRON_JSON, content_type="application/json")
 
 
 def user_count(request):
-    return JsonResponse(User.objects.count(), safe=False)
+    count = cache.get_or_set(USER_COUNT_CACHE_KEY, User.objects.count, USER_COUNT_CACHE_TIMEOUT)
+    return OrjsonResponse(count)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_count_on_create(sender, created, **kwargs):
+    # Updating an existing user doesn't change the count.
+    if created:
+        cache.delete(USER_COUNT_CACHE_KEY)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_count_on_delete(sender, **kwargs):
+    cache.delete(USER_COUNT_CACHE_KEY)
 
 
 def get_settings(request, name):
-    if hasattr(settings, name):
-        return JsonResponse(getattr(settings, name), safe=False)
+    if name in SETTINGS:
+        return OrjsonResponse(SETTINGS[name])
     else:
-        return JsonResponse({"error": f"settings {name!r} not found"}, status=404)
+        return OrjsonResponse({"error": f"settings {name!r} not found"}, status=404)
 
 
 def sleep(request):
-    duration = request.GET.get("duration")
+    duration = request.GET.get("duration", "")
+    if not duration.isdigit():
+        return HttpResponseBadRequest("duration must be a non-negative integer")
     time.sleep(int(duration))
     return HttpResponse()
 
@@ -3,21 +3,32 @@
 
 import os
 
+import bcrypt
 from flask import Flask, request
 from sqlalchemy import Column, Integer, String, create_engine, inspect
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import scoped_session, sessionmaker
-from werkzeug.security import generate_password_hash
+from sqlalchemy.orm import sessionmaker
 
 app = Flask(__name__)
 
-engine = create_engine(os.environ["POSTGRESQL_DB_CONNECT_STRING"], echo=True)
+engine = create_engine(
+    os.environ["POSTGRESQL_DB_CONNECT_STRING"],
+    # Logging every statement is only useful while debugging.
+    echo=os.environ.get("SQL_ECHO", "0") == "1",
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
 
-Session = scoped_session(sessionmaker(bind=engine))
+# Each request uses a short session, its connection goes back to the pool once it is done.
+Session = sessionmaker(bind=engine, expire_on_commit=False)
 
 
 Base = declarative_base()
 
+# bcrypt only uses the first 72 bytes of a password, recent versions refuse longer ones.
+BCRYPT_MAX_PASSWORD_BYTES = 72
+
 
 class User(Base):
     __tablename__ = "users"
@@ -30,22 +41,35 @@ class User(Base):
 @app.route("/users", methods=["POST"])
 def create_user():
     username = request.json["username"]
-    password = request.json["password"]
-    session = Session()
-    hashed_password = generate_password_hash(password)
-    new_user = User(username=username, password=hashed_password)
-
-    if session.query(User).filter_by(username=username).first():
+    password = request.json["password"].encode()
+    if len(password) > BCRYPT_MAX_PASSWORD_BYTES:
+        return f"password must be at most {BCRYPT_MAX_PASSWORD_BYTES} bytes long", 400
+    # bcrypt releases the GIL while hashing, other threads of the worker keep serving requests.
+    hashed_password = bcrypt.hashpw(password, bcrypt.gensalt()).decode()
+    # A single round-trip, the unique constraint on username decides if the user exists.
+    statement = (
+        insert(User)
+        .values(username=username, password=hashed_password)
+        .on_conflict_do_nothing(index_elements=[User.username])
+        .returning(User.id)
+    )
+    with Session.begin() as session:
+        created = session.execute(statement).first()
+
+    if created is None:
         return f"user {username} exists", 400
-
-    session.add(new_user)
-    session.commit()
     return "", 201
 
 
+# Tables are created by the migrations and never dropped, only remember the ones that exist so
+# a table created by a migration running after startup is still found.
+existing_tables: set[str] = set()
+
+
 @app.route("/tables/<table>", methods=["HEAD"])
 def test_table(table: str):
-    if inspect(engine).has_table(table):
+    if table in existing_tables or inspect(engine).has_table(table):
+        existing_tables.add(table)
         return "", 200
     else:
         return "", 404
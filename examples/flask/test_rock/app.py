@@ -1,118 +1,149 @@
 # Copyright 2024 Canonical Ltd.
 # See LICENSE file for licensing details.
 
+import concurrent.futures
+import functools
 import os
 import time
-import urllib.parse
 from urllib.parse import urlparse
 
 import boto3
 import botocore.config
-import psycopg
+import orjson
+import psycopg_pool
 import pymongo
 import pymongo.database
 import pymongo.errors
 import pymysql
 import pymysql.cursors
 import redis
-from flask import Flask, g, jsonify, request
+import sqlalchemy.pool
+from flask import Flask, copy_current_request_context, g, request
+from flask.json.provider import DefaultJSONProvider
+from flask_compress import Compress
 
-app = Flask(__name__)
-app.config.from_prefixed_env()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider using orjson, falling back to Flask's conversions for other types."""
 
-def get_mysql_database():
-    """Get the mysql db connection."""
-    if "mysql_db" not in g:
-        if "MYSQL_DB_CONNECT_STRING" in os.environ:
-            uri_parts = urlparse(os.environ["MYSQL_DB_CONNECT_STRING"])
-            g.mysql_db = pymysql.connect(
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+app = Flask(__name__)
+app.json = OrjsonProvider(app)
+app.config.from_prefixed_env()
+Compress(app)
+
+# The environment of a worker never changes after start, serialize it only once.
+ENVIRON_JSON = orjson.dumps(dict(os.environ))
+S3_BUCKET = os.environ.get("S3_BUCKET")
+MYSQL_ENABLED = "MYSQL_DB_CONNECT_STRING" in os.environ
+POSTGRESQL_ENABLED = "POSTGRESQL_DB_CONNECT_STRING" in os.environ
+# Large enough for every thread of a gthread worker plus the /all/status fan-out to get a
+# connection without waiting on each other.
+POSTGRESQL_POOL_MAX_SIZE = 16
+
+
+@functools.cache
+def get_mysql_pool() -> sqlalchemy.pool.QueuePool | None:
+    """Get the mysql connection pool shared by all requests."""
+    if "MYSQL_DB_CONNECT_STRING" in os.environ:
+        uri_parts = urlparse(os.environ["MYSQL_DB_CONNECT_STRING"])
+        return sqlalchemy.pool.QueuePool(
+            functools.partial(
+                pymysql.connect,
                 host=uri_parts.hostname,
                 user=uri_parts.username,
                 password=uri_parts.password,
                 database=uri_parts.path[1:],
                 port=uri_parts.port,
-            )
-        else:
-            return None
+            ),
+            # MySQL closes idle connections after wait_timeout, replace them before that.
+            recycle=1800,
+        )
+    return None
+
+
+def get_mysql_database():
+    """Get a mysql db connection from the pool."""
+    if not MYSQL_ENABLED:
+        return None
+    if "mysql_db" not in g:
+        g.mysql_db = get_mysql_pool().connect()
     return g.mysql_db
 
 
-def get_postgresql_database():
-    """Get the postgresql db connection."""
-    if "postgresql_db" not in g:
-        if "POSTGRESQL_DB_CONNECT_STRING" in os.environ:
-            g.postgresql_db = psycopg.connect(
-                conninfo=os.environ["POSTGRESQL_DB_CONNECT_STRING"],
-            )
-        else:
-            return None
-    return g.postgresql_db
+@functools.cache
+def get_postgresql_pool() -> psycopg_pool.ConnectionPool | None:
+    """Get the postgresql connection pool shared by all requests."""
+    if "POSTGRESQL_DB_CONNECT_STRING" in os.environ:
+        return psycopg_pool.ConnectionPool(
+            conninfo=os.environ["POSTGRESQL_DB_CONNECT_STRING"],
+            min_size=1,
+            max_size=POSTGRESQL_POOL_MAX_SIZE,
+            open=True,
+        )
+    return None
 
 
+@functools.cache
 def get_mongodb_database() -> pymongo.database.Database | None:
-    """Get the mongodb db connection."""
-    if "mongodb_db" not in g:
-        if "MONGODB_DB_CONNECT_STRING" in os.environ:
-            uri = os.environ["MONGODB_DB_CONNECT_STRING"]
-            client = pymongo.MongoClient(uri)
-            db = urllib.parse.urlparse(uri).path.removeprefix("/")
-            g.mongodb_db = client.get_database(db)
-        else:
-            return None
-    return g.mongodb_db
+    """Get the mongodb database, backed by a client pool shared by all requests."""
+    if "MONGODB_DB_CONNECT_STRING" in os.environ:
+        uri = os.environ["MONGODB_DB_CONNECT_STRING"]
+        client = pymongo.MongoClient(uri)
+        db = urlparse(uri).path.removeprefix("/")
+        return client.get_database(db)
+    return None
 
 
+@functools.cache
 def get_redis_database() -> redis.Redis | None:
-    if "redis_db" not in g:
-        if "REDIS_DB_CONNECT_STRING" in os.environ:
-            uri = os.environ["REDIS_DB_CONNECT_STRING"]
-            g.redis_db = redis.Redis.from_url(uri)
-        else:
-            return None
-    return g.redis_db
+    """Get the redis client, backed by a connection pool shared by all requests."""
+    if "REDIS_DB_CONNECT_STRING" in os.environ:
+        uri = os.environ["REDIS_DB_CONNECT_STRING"]
+        return redis.Redis.from_url(uri)
+    return None
 
 
+@functools.cache
 def get_boto3_client():
-    if "boto3_client" not in g:
-        if "S3_ACCESS_KEY" in os.environ:
-            s3_client_config = botocore.config.Config(
-                s3={
-                    "addressing_style": os.environ["S3_ADDRESSING_STYLE"],
-                },
-                # no_proxy env variable is not read by boto3, so
-                # this is needed for the tests to avoid hitting the proxy.
-                proxies={},
-            )
-            g.boto3_client = boto3.client(
-                "s3",
-                os.environ["S3_REGION"],
-                aws_access_key_id=os.environ["S3_ACCESS_KEY"],
-                aws_secret_access_key=os.environ["S3_SECRET_KEY"],
-                endpoint_url=os.environ["S3_ENDPOINT"],
-                use_ssl=False,
-                config=s3_client_config,
-            )
-        else:
-            return None
-    return g.boto3_client
-
-
-@app.teardown_appcontext
+    """Get the S3 client shared by all requests, boto3 clients are thread-safe."""
+    if "S3_ACCESS_KEY" in os.environ:
+        s3_client_config = botocore.config.Config(
+            s3={
+                "addressing_style": os.environ["S3_ADDRESSING_STYLE"],
+            },
+            # no_proxy env variable is not read by boto3, so
+            # this is needed for the tests to avoid hitting the proxy.
+            proxies={},
+            # Keep enough idle connections around for threaded workers to reuse them.
+            max_pool_connections=50,
+            retries={"max_attempts": 2},
+        )
+        return boto3.client(
+            "s3",
+            os.environ["S3_REGION"],
+            aws_access_key_id=os.environ["S3_ACCESS_KEY"],
+            aws_secret_access_key=os.environ["S3_SECRET_KEY"],
+            endpoint_url=os.environ["S3_ENDPOINT"],
+            use_ssl=False,
+            config=s3_client_config,
+        )
+    return None
+
+
+@app.teardown_request
 def teardown_database(_):
     """Tear down databases connections."""
     mysql_db = g.pop("mysql_db", None)
     if mysql_db is not None:
+        # Returns the connection to the pool.
         mysql_db.close()
-    postgresql_db = g.pop("postgresql_db", None)
-    if postgresql_db is not None:
-        postgresql_db.close()
-    mongodb_db = g.pop("mongodb_db", None)
-    if mongodb_db is not None:
-        mongodb_db.client.close()
-    boto3_client = g.pop("boto3_client", None)
-    if boto3_client is not None:
-        boto3_client.close()
 
 
 @app.route("/")
@@ -122,14 +153,22 @@ def hello_world():
 
 @app.route("/sleep")
 def sleep():
-    duration_seconds = int(request.args.get("duration"))
+    duration_seconds = request.args.get("duration", type=int)
+    if duration_seconds is None:
+        return "duration must be an integer", 400
     time.sleep(duration_seconds)
     return ""
 
 
+@functools.lru_cache(maxsize=128)
+def get_config_json(config_name: str) -> str:
+    """Serialize a config value, the configuration does not change after startup."""
+    return app.json.dumps(app.config.get(config_name))
+
+
 @app.route("/config/<config_name>")
 def config(config_name: str):
-    return jsonify(app.config.get(config_name))
+    return app.response_class(get_config_json(config_name), mimetype="application/json")
 
 
 @app.route("/mysql/status")
@@ -148,8 +187,7 @@ def mysql_status():
 def s3_status():
     """S3 status endpoint."""
     if client := get_boto3_client():
-        bucket_name = os.environ["S3_BUCKET"]
-        objectsresponse = client.list_objects(Bucket=bucket_name)
+        objectsresponse = client.list_objects(Bucket=S3_BUCKET)
         return "SUCCESS"
     return "FAIL"
 
@@ -157,8 +195,9 @@ def s3_status():
 @app.route("/postgresql/status")
 def postgresql_status():
     """Postgresql status endpoint."""
-    if database := get_postgresql_database():
-        with database.cursor() as cursor:
+    if POSTGRESQL_ENABLED:
+        # The context manager ends the transaction and gives the connection back to the pool.
+        with get_postgresql_pool().connection() as database, database.cursor() as cursor:
             sql = "SELECT version()"
             cursor.execute(sql)
             cursor.fetchone()
@@ -187,7 +226,27 @@ def redis_status():
     return "FAIL"
 
 
+STATUS_CHECKS = {
+    "mysql": mysql_status,
+    "postgresql": postgresql_status,
+    "mongodb": mongodb_status,
+    "redis": redis_status,
+}
+status_executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(STATUS_CHECKS))
+
+
+@app.route("/all/status")
+def all_status():
+    """Status endpoint running all the database checks concurrently."""
+    # Each check runs in its own copy of the request context, so it gets its own connections.
+    futures = {
+        name: status_executor.submit(copy_current_request_context(check))
+        for name, check in STATUS_CHECKS.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
 @app.route("/env")
 def get_env():
     """Return environment variables"""
-    return jsonify(dict(os.environ))
+    return app.response_class(ENVIRON_JSON, mimetype="application/json")
@@ -5,53 +5,30 @@
 
 """Module __init__."""
 
+import importlib.util
+
 from paas_app_charmer import exceptions
 
-# Try the charm library imports to check whether they are present
-try:
-    import charms.traefik_k8s.v2.ingress  # noqa: F401
-except ImportError as import_error:
-    raise exceptions.MissingCharmLibraryError(
-        "Missing charm library, please run `charmcraft fetch-lib charms.traefik_k8s.v2.ingress`"
-    ) from import_error
-try:
-    import charms.observability_libs.v0.juju_topology  # noqa: F401
-except ImportError as import_error:
-    raise exceptions.MissingCharmLibraryError(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.observability_libs.v0.juju_topology`"
-    ) from import_error
-try:
-    import charms.grafana_k8s.v0.grafana_dashboard  # noqa: F401
-except ImportError as import_error:
-    raise exceptions.MissingCharmLibraryError(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.grafana_k8s.v0.grafana_dashboard`"
-    ) from import_error
-try:
-    import charms.loki_k8s.v0.loki_push_api  # noqa: F401
-except ImportError as import_error:
-    raise exceptions.MissingCharmLibraryError(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.loki_k8s.v0.loki_push_api`"
-    ) from import_error
-try:
-    import charms.prometheus_k8s.v0.prometheus_scrape  # noqa: F401
-except ImportError as import_error:
-    raise exceptions.MissingCharmLibraryError(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.prometheus_k8s.v0.prometheus_scrape`"
-    ) from import_error
-try:
-    import charms.data_platform_libs.v0.data_interfaces  # noqa: F401
-except ImportError as import_error:
-    raise exceptions.MissingCharmLibraryError(
-        "Missing charm library, please run "
-        "`charmcraft fetch-lib charms.data_platform_libs.v0.data_interfaces`"
-    ) from import_error
-try:
-    import charms.redis_k8s.v0.redis  # noqa: F401
-except ImportError as import_error:
-    raise exceptions.MissingCharmLibraryError(
-        "Missing charm library, please run `charmcraft fetch-lib charms.redis_k8s.v0.redis`"
-    ) from import_error
+_REQUIRED_CHARM_LIBRARIES = (
+    "charms.traefik_k8s.v2.ingress",
+    "charms.observability_libs.v0.juju_topology",
+    "charms.grafana_k8s.v0.grafana_dashboard",
+    "charms.loki_k8s.v0.loki_push_api",
+    "charms.prometheus_k8s.v0.prometheus_scrape",
+    "charms.data_platform_libs.v0.data_interfaces",
+    "charms.redis_k8s.v0.redis",
+)
+
+# Check whether the charm libraries are present without importing them, the modules using them
+# import them when needed.
+for _charm_library in _REQUIRED_CHARM_LIBRARIES:
+    try:
+        _charm_library_spec = importlib.util.find_spec(_charm_library)
+    except ModuleNotFoundError as import_error:
+        raise exceptions.MissingCharmLibraryError(
+            f"Missing charm library, please run `charmcraft fetch-lib {_charm_library}`"
+        ) from import_error
+    if _charm_library_spec is None:
+        raise exceptions.MissingCharmLibraryError(
+            f"Missing charm library, please run `charmcraft fetch-lib {_charm_library}`"
+        )
@@ -2,8 +2,9 @@
 # See LICENSE file for licensing details.
 
 """The base Gunicorn charm class for all WSGI application charms."""
-import abc
+
 import logging
+import typing
 
 import ops
 from charms.data_platform_libs.v0.data_interfaces import DatabaseRequiresEvent
@@ -20,7 +21,7 @@ from paas_app_charmer._gunicorn.workload_config import WorkloadConfig
 from paas_app_charmer._gunicorn.wsgi_app import WsgiApp
 from paas_app_charmer.database_migration import DatabaseMigration, DatabaseMigrationStatus
 from paas_app_charmer.databases import make_database_requirers
-from paas_app_charmer.exceptions import CharmConfigInvalidError
+from paas_app_charmer.exceptions import CharmConfigInvalidError, MissingCharmLibraryError
 
 logger = logging.getLogger(__name__)
 
@@ -29,34 +30,79 @@ logger = logging.getLogger(__name__)
 try:
     # pylint: disable=ungrouped-imports
     from charms.data_platform_libs.v0.s3 import S3Requirer
+
+    _HAS_S3 = True
 except ImportError:
-    logger.exception(
-        "Missing charm library, please run `charmcraft fetch-lib charms.data_platform_libs.v0.s3`"
-    )
+    _HAS_S3 = False
+    logger.debug("Charm library charms.data_platform_libs.v0.s3 is not available")
 
 try:
     # pylint: disable=ungrouped-imports
     from charms.saml_integrator.v0.saml import SamlRequires
+
+    _HAS_SAML = True
 except ImportError:
-    logger.exception(
-        "Missing charm library, please run `charmcraft fetch-lib charms.saml_integrator.v0.saml`"
-    )
+    _HAS_SAML = False
+    logger.debug("Charm library charms.saml_integrator.v0.saml is not available")
+
+
+def _requires_integration(charm_meta: ops.CharmMeta, name: str) -> bool:
+    """Check if the charm requires the integration of the same name as its interface.
+
+    Args:
+        charm_meta: the charm metadata.
+        name: the integration and interface name.
+
+    Returns:
+        True if the charm declares the integration.
+    """
+    relation = charm_meta.requires.get(name)
+    return relation is not None and relation.interface_name == name
+
+
+def _check_charm_library(is_available: bool, library: str) -> None:
+    """Check that an optional charm library needed by a declared integration was fetched.
 
+    Args:
+        is_available: whether the charm library could be imported.
+        library: the charm library module name.
 
-class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance-attributes
+    Raises:
+        MissingCharmLibraryError: if the charm library is not available.
+    """
+    if not is_available:
+        raise MissingCharmLibraryError(
+            f"Missing charm library, please run `charmcraft fetch-lib {library}`"
+        )
+
+
+class GunicornBase(ops.CharmBase):  # pylint: disable=too-many-instance-attributes
     """Gunicorn-based charm service mixin.
 
+    Subclasses must implement get_wsgi_config and get_cos_dir.
+
     Attrs:
         on: charm events replaced by Redis ones for the Redis charm library.
     """
 
-    @abc.abstractmethod
     def get_wsgi_config(self) -> BaseModel:
-        """Return the framework related configurations."""
+        """Return the framework related configurations.
+
+        The result must only depend on the charm configuration (self.config), the validated
+        configurations are reused as long as the charm configuration doesn't change.
+
+        Raises:
+            NotImplementedError: if the subclass does not implement it.
+        """
+        raise NotImplementedError
 
-    @abc.abstractmethod
     def get_cos_dir(self) -> str:
-        """Return the directory with COS related files."""
+        """Return the directory with COS related files.
+
+        Raises:
+            NotImplementedError: if the subclass does not implement it.
+        """
+        raise NotImplementedError
 
     on = RedisRelationCharmEvents()
 
@@ -69,43 +115,70 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
         """
         super().__init__(framework)
         self._wsgi_framework = wsgi_framework
+        # Both caches only live for the duration of a single event handler, see
+        # block_if_invalid_config.
+        self._charm_state_cache: CharmState | None = None
+        self._wsgi_app_cache: tuple[CharmState, WsgiApp] | None = None
+        # What the workload was last successfully restarted with by this charm process.
+        self._restart_fingerprint: tuple[object, ...] | None = None
+        # The validated WSGI configuration and the charm configuration it was validated from.
+        self._wsgi_config_cache: tuple[tuple[object, ...], BaseModel] | None = None
 
         self._secret_storage = GunicornSecretStorage(
             charm=self, key=f"{wsgi_framework}_secret_key"
         )
         self._database_requirers = make_database_requirers(self, self.app.name)
 
-        requires = self.framework.meta.requires
-        if "redis" in requires and requires["redis"].interface_name == "redis":
+        if _requires_integration(self.framework.meta, "redis"):
             self._redis = RedisRequires(charm=self, relation_name="redis")
             self.framework.observe(self.on.redis_relation_updated, self._on_redis_relation_updated)
         else:
             self._redis = None
 
-        if "s3" in requires and requires["s3"].interface_name == "s3":
+        if _requires_integration(self.framework.meta, "s3"):
+            _check_charm_library(_HAS_S3, "charms.data_platform_libs.v0.s3")
             self._s3 = S3Requirer(charm=self, relation_name="s3", bucket_name=self.app.name)
             self.framework.observe(self._s3.on.credentials_changed, self._on_s3_credential_changed)
             self.framework.observe(self._s3.on.credentials_gone, self._on_s3_credential_gone)
         else:
             self._s3 = None
 
-        if "saml" in requires and requires["saml"].interface_name == "saml":
+        if _requires_integration(self.framework.meta, "saml"):
+            _check_charm_library(_HAS_SAML, "charms.saml_integrator.v0.saml")
             self._saml = SamlRequires(self)
             self.framework.observe(self._saml.on.saml_data_available, self._on_saml_data_available)
         else:
             self._saml = None
 
+        # Only the integrations the charm waits for in _missing_required_integrations count,
+        # ingress and logging are usually not optional but don't block the workload.
+        managed_integrations = [
+            *self._database_requirers,
+            *(
+                name
+                for name, requirer in (
+                    ("redis", self._redis),
+                    ("s3", self._s3),
+                    ("saml", self._saml),
+                )
+                if requirer is not None
+            ),
+        ]
+        requires = self.framework.meta.requires
+        self._required_integrations = frozenset(
+            name
+            for name in managed_integrations
+            if (relation := requires.get(name)) is not None and not relation.optional
+        )
+
         self._workload_config = WorkloadConfig(self._wsgi_framework)
+        self._container = self.unit.get_container(self._workload_config.container_name)
 
         self._database_migration = DatabaseMigration(
-            container=self.unit.get_container(self._workload_config.container_name),
+            container=self._container,
             state_dir=self._workload_config.state_dir,
         )
 
-        self._webserver_config = WebserverConfig.from_charm(self)
-
-        self._container = self.unit.get_container(f"{self._workload_config.framework}-app")
-
         self._ingress = IngressPerAppRequirer(
             self,
             port=self._workload_config.port,
@@ -119,26 +192,39 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
             cos_dir=self.get_cos_dir(),
         )
 
-        self.framework.observe(self.on.config_changed, self._on_config_changed)
-        self.framework.observe(self.on.rotate_secret_key_action, self._on_rotate_secret_key_action)
-        self.framework.observe(
-            self.on.secret_storage_relation_changed,
-            self._on_secret_storage_relation_changed,
-        )
-        self.framework.observe(self.on.update_status, self._on_update_status)
-        for database, database_requirer in self._database_requirers.items():
-            self.framework.observe(
-                database_requirer.on.database_created,
-                getattr(self, f"_on_{database}_database_database_created"),
-            )
-            self.framework.observe(
-                database_requirer.on.endpoints_changed,
-                getattr(self, f"_on_{database}_database_endpoints_changed"),
-            )
-            self.framework.observe(
-                self.on[database_requirer.relation_name].relation_broken,
-                getattr(self, f"_on_{database}_database_relation_broken"),
+        observers: list[tuple[ops.BoundEvent, typing.Callable[[typing.Any], None]]] = [
+            (self.on.config_changed, self._on_config_changed),
+            (self.on.rotate_secret_key_action, self._on_rotate_secret_key_action),
+            (self.on.secret_storage_relation_changed, self._on_secret_storage_relation_changed),
+            (self.on.update_status, self._on_update_status),
+            (
+                self.on[self._workload_config.container_name].pebble_ready,
+                self._on_workload_pebble_ready,
+            ),
+        ]
+        for database_requirer in self._database_requirers.values():
+            observers.extend(
+                (database_event, self._on_database_event)
+                for database_event in (
+                    database_requirer.on.database_created,
+                    database_requirer.on.endpoints_changed,
+                    self.on[database_requirer.relation_name].relation_broken,
+                )
             )
+        for event, observer in observers:
+            self.framework.observe(event, observer)
+
+    @property
+    def _webserver_config(self) -> WebserverConfig:
+        """Get the webserver configuration, only built by the hooks restarting the workload.
+
+        It's read from the charm configuration every time, since the configuration can change
+        during the lifetime of the charm object (for example with the testing Harness).
+
+        Returns:
+            The webserver configuration from the charm configuration.
+        """
+        return WebserverConfig.from_charm(self)
 
     @block_if_invalid_config
     def _on_config_changed(self, _event: ops.EventBase) -> None:
@@ -163,6 +249,9 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
             event.fail("charm is still initializing")
             return
         self._secret_storage.reset_secret_key()
+        # The cached charm state still holds the previous secret key.
+        self._charm_state_cache = None
+        self._charm_state_cache = self._build_charm_state()
         event.set_results({"status": "success"})
         self.restart()
 
@@ -207,6 +296,7 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
         missing_integrations = self._missing_required_integrations(charm_state)
         if missing_integrations:
             self._build_wsgi_app().stop_all_services()
+            self._restart_fingerprint = None
             self._database_migration.set_status_to_pending()
             message = f"missing integrations: {', '.join(missing_integrations)}"
             logger.info(message)
@@ -224,36 +314,44 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
         Returns:
             list of names of missing integrations
         """
-        missing_integrations = []
-        requires = self.framework.meta.requires
-        for name in self._database_requirers.keys():
-            if (
-                name not in charm_state.integrations.databases_uris
-                or charm_state.integrations.databases_uris[name] is None
-            ):
-                if not requires[name].optional:
-                    missing_integrations.append(name)
-        if self._redis and not charm_state.integrations.redis_uri:
-            if not requires["redis"].optional:
-                missing_integrations.append("redis")
-        if self._s3 and not charm_state.integrations.s3_parameters:
-            if not requires["s3"].optional:
-                missing_integrations.append("s3")
-        if self._saml and not charm_state.integrations.saml_parameters:
-            if not requires["saml"].optional:
-                missing_integrations.append("saml")
-        return missing_integrations
+        if not self._required_integrations:
+            return []
+        integrations = charm_state.integrations
+        unavailable_integrations = [
+            name
+            for name in self._database_requirers
+            if integrations.databases_uris.get(name) is None
+        ]
+        if self._redis and not integrations.redis_uri:
+            unavailable_integrations.append("redis")
+        if self._s3 and not integrations.s3_parameters:
+            unavailable_integrations.append("s3")
+        if self._saml and not integrations.saml_parameters:
+            unavailable_integrations.append("saml")
+        return [name for name in unavailable_integrations if name in self._required_integrations]
 
     def restart(self) -> None:
         """Restart or start the service if not started with the latest configuration."""
         if not self.is_ready():
             return
+        wsgi_app = self._build_wsgi_app()
+        # Several events of the same hook often lead to identical restarts, only the first one
+        # needs to talk to Pebble.
+        restart_fingerprint = (
+            tuple(sorted(wsgi_app.gen_environment().items())),
+            tuple(self._webserver_config.items()),
+        )
+        if restart_fingerprint == self._restart_fingerprint:
+            logger.info("service already restarted with the latest configuration")
+            self.update_app_and_unit_status(ops.ActiveStatus())
+            return
         try:
             self.update_app_and_unit_status(ops.MaintenanceStatus("Preparing service for restart"))
-            self._build_wsgi_app().restart()
+            wsgi_app.restart()
         except CharmConfigInvalidError as exc:
             self.update_app_and_unit_status(ops.BlockedStatus(exc.msg))
             return
+        self._restart_fingerprint = restart_fingerprint
         self.update_app_and_unit_status(ops.ActiveStatus())
 
     def _gen_environment(self) -> dict[str, str]:
@@ -273,8 +371,10 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
         This method may raise CharmConfigInvalidError.
 
         Returns:
-            New CharmState
+            The CharmState cached for the current event handler if any, otherwise a new CharmState.
         """
+        if self._charm_state_cache is not None:
+            return self._charm_state_cache
         if self._saml:
             saml_relation = self.model.get_relation(self._saml.relation_name)
             if saml_relation and saml_relation.app in saml_relation.data:
@@ -287,7 +387,7 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
         return CharmState.from_charm(
             charm=self,
             framework=self._wsgi_framework,
-            wsgi_config=self.get_wsgi_config(),
+            wsgi_config=self._get_validated_wsgi_config(),
             secret_storage=self._secret_storage,
             database_requirers=self._database_requirers,
             redis_uri=self._redis.url if self._redis is not None else None,
@@ -295,27 +395,57 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
             saml_relation_data=saml_relation_data,
         )
 
+    def _get_validated_wsgi_config(self) -> BaseModel:
+        """Get the framework related configurations, validating them only if the config changed.
+
+        The validated configurations are keyed on the charm configuration only, which relies on
+        get_wsgi_config not reading anything else (relation data, secrets, environment...).
+
+        This method may raise CharmConfigInvalidError.
+
+        Returns:
+            The framework related configurations.
+        """
+        config_key = tuple(sorted(self.config.items()))
+        if self._wsgi_config_cache is not None and self._wsgi_config_cache[0] == config_key:
+            return self._wsgi_config_cache[1]
+        wsgi_config = self.get_wsgi_config()
+        self._wsgi_config_cache = (config_key, wsgi_config)
+        return wsgi_config
+
     def _build_wsgi_app(self) -> WsgiApp:
         """Build a WsgiApp instance.
 
         Returns:
-            A new WsgiApp instance.
+            The WsgiApp instance for the current charm state.
         """
         charm_state = self._build_charm_state()
+        if self._wsgi_app_cache is not None and self._wsgi_app_cache[0] is charm_state:
+            return self._wsgi_app_cache[1]
 
         webserver = GunicornWebserver(
             webserver_config=self._webserver_config,
             workload_config=self._workload_config,
-            container=self.unit.get_container(self._workload_config.container_name),
+            container=self._container,
         )
 
-        return WsgiApp(
+        wsgi_app = WsgiApp(
             container=self._container,
             charm_state=charm_state,
             workload_config=self._workload_config,
             webserver=webserver,
             database_migration=self._database_migration,
         )
+        self._wsgi_app_cache = (charm_state, wsgi_app)
+        return wsgi_app
+
+    def _on_workload_pebble_ready(self, _event: ops.PebbleReadyEvent) -> None:
+        """Forget the last restart, a new Pebble instance has none of its configuration.
+
+        Args:
+            _event: the pebble-ready event of the workload container.
+        """
+        self._restart_fingerprint = None
 
     @block_if_invalid_config
     def _on_update_status(self, _: ops.HookEvent) -> None:
@@ -324,48 +454,8 @@ class GunicornBase(abc.ABC, ops.CharmBase):  # pylint: disable=too-many-instance
             self.restart()
 
     @block_if_invalid_config
-    def _on_mysql_database_database_created(self, _event: DatabaseRequiresEvent) -> None:
-        """Handle mysql's database-created event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_mysql_database_endpoints_changed(self, _event: DatabaseRequiresEvent) -> None:
-        """Handle mysql's endpoints-changed event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_mysql_database_relation_broken(self, _event: ops.RelationBrokenEvent) -> None:
-        """Handle mysql's relation-broken event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_postgresql_database_database_created(self, _event: DatabaseRequiresEvent) -> None:
-        """Handle postgresql's database-created event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_postgresql_database_endpoints_changed(self, _event: DatabaseRequiresEvent) -> None:
-        """Handle mysql's endpoints-changed event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_postgresql_database_relation_broken(self, _event: ops.RelationBrokenEvent) -> None:
-        """Handle postgresql's relation-broken event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_mongodb_database_database_created(self, _event: DatabaseRequiresEvent) -> None:
-        """Handle mongodb's database-created event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_mongodb_database_endpoints_changed(self, _event: DatabaseRequiresEvent) -> None:
-        """Handle mysql's endpoints-changed event."""
-        self.restart()
-
-    @block_if_invalid_config
-    def _on_mongodb_database_relation_broken(self, _event: ops.RelationBrokenEvent) -> None:
-        """Handle postgresql's relation-broken event."""
+    def _on_database_event(self, _event: ops.EventBase) -> None:
+        """Handle the database-created, endpoints-changed and relation-broken events."""
         self.restart()
 
     @block_if_invalid_config
@@ -2,6 +2,7 @@
 # See LICENSE file for licensing details.
 
 """This module defines the CharmState class which represents the state of the charm."""
+import functools
 import logging
 import os
 import typing
@@ -100,12 +101,14 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
         Return:
             The CharmState instance created by the provided charm.
         """
+        excluded_prefixes = (f"{framework}-", "webserver-")
+        wsgi_config_keys = type(wsgi_config).model_fields.keys() | (wsgi_config.model_extra or {})
         app_config = {
-            k.replace("-", "_"): v
+            app_config_key: v
             for k, v in charm.config.items()
-            if not any(k.startswith(prefix) for prefix in (f"{framework}-", "webserver-"))
+            if not k.startswith(excluded_prefixes)
+            and (app_config_key := k.replace("-", "_")) not in wsgi_config_keys
         }
-        app_config = {k: v for k, v in app_config.items() if k not in wsgi_config.dict().keys()}
 
         integrations = IntegrationsState.build(
             redis_uri=redis_uri,
@@ -115,7 +118,13 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
         )
         return cls(
             framework=framework,
-            wsgi_config=wsgi_config.dict(exclude_unset=True, exclude_none=True),
+            # The WSGI configurations are flat, reading the set fields is equivalent to
+            # model_dump(exclude_unset=True, exclude_none=True) without the serializer.
+            wsgi_config={
+                name: value
+                for name in sorted(wsgi_config.model_fields_set)
+                if (value := getattr(wsgi_config, name)) is not None
+            },
             app_config=typing.cast(dict[str, str | int | bool], app_config),
             secret_key=(
                 secret_storage.get_secret_key() if secret_storage.is_initialized else None
@@ -124,20 +133,20 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
             integrations=integrations,
         )
 
-    @property
+    @functools.cached_property
     def proxy(self) -> "ProxyConfig":
         """Get charm proxy information from juju charm environment.
 
+        The juju charm environment doesn't change during a hook, so it's read only once.
+
         Returns:
             charm proxy information in the form of `ProxyConfig`.
         """
-        http_proxy = os.environ.get("JUJU_CHARM_HTTP_PROXY")
-        https_proxy = os.environ.get("JUJU_CHARM_HTTPS_PROXY")
-        no_proxy = os.environ.get("JUJU_CHARM_NO_PROXY")
+        env = os.environ
         return ProxyConfig(
-            http_proxy=http_proxy if http_proxy else None,
-            https_proxy=https_proxy if https_proxy else None,
-            no_proxy=no_proxy,
+            http_proxy=env.get("JUJU_CHARM_HTTP_PROXY") or None,
+            https_proxy=env.get("JUJU_CHARM_HTTPS_PROXY") or None,
+            no_proxy=env.get("JUJU_CHARM_NO_PROXY"),
         )
 
     @property
@@ -185,7 +194,7 @@ class CharmState:  # pylint: disable=too-many-instance-attributes
         return self._is_secret_storage_ready
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IntegrationsState:
     """State of the integrations.
 
@@ -15,7 +15,13 @@ logger = logging.getLogger(__name__)
 
 
 class GunicornBaseProtocol(typing.Protocol):  # pylint: disable=too-few-public-methods
-    """Protocol to use for the decorator to block if invalid."""
+    """Protocol to use for the decorator to block if invalid.
+
+    Attrs:
+        _charm_state_cache: the charm state shared by the running event handler, if any.
+    """
+
+    _charm_state_cache: CharmState | None
 
     def _build_charm_state(self) -> CharmState:
         """Build charm state."""
@@ -37,6 +43,9 @@ def block_if_invalid_config(
 ) -> typing.Callable[[C, E], None]:
     """Create a decorator that puts the charm in blocked state if the config is wrong.
 
+    The charm state is built once when the observer is invoked and reused by the observer until
+    it returns.
+
     Args:
         method: observer method to wrap.
 
@@ -55,12 +64,15 @@ def block_if_invalid_config(
         Returns:
             The value returned from the original function. That is, None.
         """
+        # pylint: disable=protected-access
         try:
-            instance._build_charm_state()  # pylint: disable=protected-access
+            instance._charm_state_cache = instance._build_charm_state()
             return method(instance, event)
         except CharmConfigInvalidError as exc:
             logger.exception("Wrong Charm Configuration")
             instance.update_app_and_unit_status(ops.BlockedStatus(exc.msg))
             return None
+        finally:
+            instance._charm_state_cache = None
 
     return wrapper
@@ -4,6 +4,7 @@
 """Provide the GunicornWebserver class to represent the gunicorn server."""
 import dataclasses
 import datetime
+import functools
 import logging
 import pathlib
 import shlex
@@ -30,25 +31,28 @@ class WebserverConfig:
         keepalive: The time to wait for requests on a Keep-Alive connection,
             or None if not specified.
         timeout: The request silence timeout for the web server, or None if not specified.
+        worker_class: The type of workers to use for the web server, or None if not specified.
     """
 
     workers: int | None = None
     threads: int | None = None
     keepalive: datetime.timedelta | None = None
     timeout: datetime.timedelta | None = None
+    worker_class: str | None = None
 
-    def items(self) -> typing.Iterable[tuple[str, int | datetime.timedelta | None]]:
+    def items(self) -> typing.Iterable[tuple[str, str | int | datetime.timedelta | None]]:
         """Return the dataclass values as an iterable of the key-value pairs.
 
         Returns:
             An iterable of the key-value pairs.
         """
-        return {
-            "workers": self.workers,
-            "threads": self.threads,
-            "keepalive": self.keepalive,
-            "timeout": self.timeout,
-        }.items()
+        return (
+            ("workers", self.workers),
+            ("threads", self.threads),
+            ("keepalive", self.keepalive),
+            ("timeout", self.timeout),
+            ("worker_class", self.worker_class),
+        )
 
     @classmethod
     def from_charm(cls, charm: ops.CharmBase) -> "WebserverConfig":
@@ -64,6 +68,7 @@ class WebserverConfig:
         timeout = charm.config.get("webserver-timeout")
         workers = charm.config.get("webserver-workers")
         threads = charm.config.get("webserver-threads")
+        worker_class = charm.config.get("webserver-worker-class")
         return cls(
             workers=int(typing.cast(str, workers)) if workers is not None else None,
             threads=int(typing.cast(str, threads)) if threads is not None else None,
@@ -71,6 +76,7 @@ class WebserverConfig:
                 datetime.timedelta(seconds=int(keepalive)) if keepalive is not None else None
             ),
             timeout=(datetime.timedelta(seconds=int(timeout)) if timeout is not None else None),
+            worker_class=str(worker_class) if worker_class else None,
         )
 
 
@@ -95,36 +101,38 @@ class GunicornWebserver:  # pylint: disable=too-few-public-methods
         self._container = container
         self._reload_signal = signal.SIGHUP
 
-    @property
+    @functools.cached_property
     def _config(self) -> str:
         """Generate the content of the Gunicorn configuration file based on charm states.
 
+        The webserver and workload configurations don't change during the lifetime of the
+        GunicornWebserver instance, so the content is only rendered once.
+
         Returns:
             The content of the Gunicorn configuration file.
         """
         config_entries = []
         for setting, setting_value in self._webserver_config.items():
-            setting_value = typing.cast(None | int | datetime.timedelta, setting_value)
+            setting_value = typing.cast(None | str | int | datetime.timedelta, setting_value)
             if setting_value is None:
                 continue
-            setting_value = (
-                setting_value
-                if isinstance(setting_value, int)
-                else int(setting_value.total_seconds())
-            )
+            if isinstance(setting_value, str):
+                setting_value = repr(setting_value)
+            elif isinstance(setting_value, datetime.timedelta):
+                setting_value = int(setting_value.total_seconds())
             config_entries.append(f"{setting} = {setting_value}")
         new_line = "\n"
         config = f"""\
 bind = ['0.0.0.0:{self._workload_config.port}']
 chdir = {repr(str(self._workload_config.app_dir))}
-accesslog = {repr(str(self._workload_config.application_log_file.absolute()))}
-errorlog = {repr(str(self._workload_config.application_error_log_file.absolute()))}
+accesslog = {repr(str(self._workload_config.application_log_file))}
+errorlog = {repr(str(self._workload_config.application_error_log_file))}
 statsd_host = {repr(self._workload_config.statsd_host)}
 {new_line.join(config_entries)}"""
         return config
 
     @property
-    def _config_path(self) -> pathlib.Path:
+    def _config_path(self) -> pathlib.PurePath:
         """Gets the path to the Gunicorn configuration file.
 
         Returns:
@@ -133,14 +141,24 @@ statsd_host = {repr(self._workload_config.statsd_host)}
         return self._workload_config.base_dir / "gunicorn.conf.py"
 
     def update_config(
-        self, environment: dict[str, str], is_webserver_running: bool, command: str
+        self,
+        environment: dict[str, str],
+        is_webserver_running: bool,
+        command: str,
+        is_environment_changed: bool = True,
     ) -> None:
         """Update and apply the configuration file of the web server.
 
+        The configuration is checked with the application environment, so the check is only
+        skipped when neither the configuration file nor the environment changed. A configuration
+        file failing the check is not left in the container.
+
         Args:
             environment: Environment variables used to run the application.
             is_webserver_running: Indicates if the web server container is currently running.
             command: The WSGI application startup command.
+            is_environment_changed: Whether the environment differs from the one the running
+                application was started with.
 
         Raises:
             CharmConfigInvalidError: if the charm configuration is not valid.
@@ -148,12 +166,16 @@ statsd_host = {repr(self._workload_config.statsd_host)}
         self._prepare_log_dir()
         webserver_config_path = str(self._config_path)
         try:
-            current_webserver_config = self._container.pull(webserver_config_path)
+            with self._container.pull(webserver_config_path) as config_file:
+                current_webserver_config = config_file.read()
         except PathError:
             current_webserver_config = None
-        self._container.push(webserver_config_path, self._config)
-        if current_webserver_config == self._config:
+        config = self._config
+        is_config_changed = current_webserver_config != config
+        if not is_config_changed and not is_environment_changed:
             return
+        if is_config_changed:
+            self._container.push(webserver_config_path, config)
         check_config_command = shlex.split(command)
         check_config_command.append("--check-config")
         exec_process = self._container.exec(
@@ -171,26 +193,33 @@ statsd_host = {repr(self._workload_config.statsd_host)}
                 exc.stdout,
                 exc.stderr,
             )
+            if is_config_changed:
+                if current_webserver_config is None:
+                    self._container.remove_path(webserver_config_path)
+                else:
+                    self._container.push(webserver_config_path, current_webserver_config)
             raise CharmConfigInvalidError(
                 "Webserver configuration check failed, "
                 "please review your charm configuration or database relation"
             ) from exc
-        if is_webserver_running:
+        if is_config_changed and is_webserver_running:
             logger.info("gunicorn config changed, reloading")
             self._container.send_signal(self._reload_signal, self._workload_config.service_name)
 
     def _prepare_log_dir(self) -> None:
         """Prepare access and error log directory for the application."""
-        container = self._container
-        for log in (
-            self._workload_config.application_log_file,
-            self._workload_config.application_error_log_file,
-        ):
-            log_dir = str(log.parent.absolute())
-            if not container.exists(log_dir):
-                container.make_dir(
-                    log_dir,
-                    make_parents=True,
-                    user=self._workload_config.user,
-                    group=self._workload_config.group,
-                )
+        log_dirs = {
+            str(log.parent)
+            for log in (
+                self._workload_config.application_log_file,
+                self._workload_config.application_error_log_file,
+            )
+        }
+        # make_parents also makes make_dir succeed when the directory already exists.
+        for log_dir in log_dirs:
+            self._container.make_dir(
+                log_dir,
+                make_parents=True,
+                user=self._workload_config.user,
+                group=self._workload_config.group,
+            )
@@ -41,16 +41,16 @@ class WorkloadConfig:  # pylint: disable=too-many-instance-attributes,too-few-pu
         """
         self.framework = framework
         self.container_name = f"{self.framework}-app"
-        self.base_dir = pathlib.Path(f"/{framework}")
-        self.application_log_file = pathlib.Path(f"/var/log/{self.framework}/access.log")
-        self.application_error_log_file = pathlib.Path(f"/var/log/{self.framework}/error.log")
-        self.base_dir = pathlib.Path(f"/{framework}")
+        self.base_dir = pathlib.PurePosixPath(f"/{framework}")
+        log_dir = pathlib.PurePosixPath(f"/var/log/{self.framework}")
+        self.application_log_file = log_dir / "access.log"
+        self.application_error_log_file = log_dir / "error.log"
         self.app_dir = self.base_dir / "app"
         self.state_dir = self.base_dir / "state"
         self.service_name = self.framework
 
     @property
-    def log_files(self) -> list[str | pathlib.Path]:
+    def log_files(self) -> list[str | pathlib.PurePath]:
         """Return list of log files to monitor."""
         return [
             self.application_log_file,
@@ -7,6 +7,7 @@ import json
 import logging
 
 import ops
+from ops.pebble import PathError
 
 from paas_app_charmer._gunicorn.charm_state import CharmState, IntegrationsState
 from paas_app_charmer._gunicorn.webserver import GunicornWebserver
@@ -41,6 +42,7 @@ class WsgiApp:  # pylint: disable=too-few-public-methods
         self._container = container
         self._webserver = webserver
         self._database_migration = database_migration
+        self._environment: dict[str, str] | None = None
 
     def _encode_env(self, value: str | int | float | bool | list | dict) -> str:
         """Encode the environment variable values.
@@ -67,10 +69,24 @@ class WsgiApp:  # pylint: disable=too-few-public-methods
         Returns:
             A dictionary representing the WSGI application environment variables.
         """
-        config = self._charm_state.app_config
-        config.update(self._charm_state.wsgi_config)
+        # The charm state can't change during the lifetime of the WsgiApp instance.
+        if self._environment is None:
+            self._environment = self._build_environment()
+        return dict(self._environment)
+
+    def _build_environment(self) -> dict[str, str]:
+        """Build the WSGI environment dictionary, see gen_environment.
+
+        Returns:
+            A dictionary representing the WSGI application environment variables.
+        """
         prefix = f"{self._workload_config.framework.upper()}_"
-        env = {f"{prefix}{k.upper()}": self._encode_env(v) for k, v in config.items()}
+        # WSGI configurations come last so they take precedence over user-defined ones.
+        env = {
+            f"{prefix}{k.upper()}": self._encode_env(v)
+            for config in (self._charm_state.app_config, self._charm_state.wsgi_config)
+            for k, v in config.items()
+        }
         secret_key_env = f"{prefix}SECRET_KEY"
         if secret_key_env not in env:
             env[secret_key_env] = self._charm_state.secret_key
@@ -103,6 +119,28 @@ class WsgiApp:  # pylint: disable=too-few-public-methods
 
         return ops.pebble.LayerDict(services=services)
 
+    def _get_migration_command(self) -> list[str] | None:
+        """Get the command to run the database migration script of the application.
+
+        Returns:
+            The database migration command, or None if the application has no migration script.
+        """
+        app_dir = self._workload_config.app_dir
+        try:
+            app_files = {file.name for file in self._container.list_files(app_dir)}
+        except PathError:
+            return None
+        if "manage.py" in app_files:
+            # Django migrate command
+            return ["python3", "manage.py", "migrate"]
+        if "migrate.py" in app_files:
+            return ["python3", "migrate.py"]
+        if "migrate.sh" in app_files:
+            return ["bash", "-eo", "pipefail", "migrate.sh"]
+        if "migrate" in app_files:
+            return [str(app_dir / "migrate")]
+        return None
+
     def stop_all_services(self) -> None:
         """Stop all the services in the workload.
 
@@ -115,35 +153,36 @@ class WsgiApp:  # pylint: disable=too-few-public-methods
 
     def restart(self) -> None:
         """Restart or start the WSGI service if not started with the latest configuration."""
-        self._container.add_layer("charm", self._wsgi_layer(), combine=True)
+        wsgi_layer = self._wsgi_layer()
         service_name = self._workload_config.service_name
-        is_webserver_running = self._container.get_service(service_name).is_running()
-        command = self._wsgi_layer()["services"][self._workload_config.framework]["command"]
+        wsgi_service = wsgi_layer["services"][service_name]
+        current_service = self._container.get_plan().services.get(service_name)
+        is_layer_changed = current_service is None or current_service.to_dict() != wsgi_service
+        services = self._container.get_services()
+        environment = self.gen_environment()
+        # The webserver configuration is checked before the layer is updated, so a failing check
+        # leaves the layer unchanged and the check runs again on the next restart.
         self._webserver.update_config(
-            environment=self.gen_environment(),
-            is_webserver_running=is_webserver_running,
-            command=command,
+            environment=environment,
+            is_webserver_running=services[service_name].is_running(),
+            command=wsgi_layer["services"][self._workload_config.framework]["command"],
+            is_environment_changed=(
+                current_service is None or current_service.environment != environment
+            ),
         )
-        migration_command = None
-        app_dir = self._workload_config.app_dir
-        if self._container.exists(app_dir / "migrate"):
-            migration_command = [str((app_dir / "migrate").absolute())]
-        if self._container.exists(app_dir / "migrate.sh"):
-            migration_command = ["bash", "-eo", "pipefail", "migrate.sh"]
-        if self._container.exists(app_dir / "migrate.py"):
-            migration_command = ["python3", "migrate.py"]
-        if self._container.exists(app_dir / "manage.py"):
-            # Django migrate command
-            migration_command = ["python3", "manage.py", "migrate"]
+        if is_layer_changed:
+            self._container.add_layer("charm", wsgi_layer, combine=True)
+        migration_command = self._get_migration_command()
         if migration_command:
             self._database_migration.run(
                 command=migration_command,
-                environment=self.gen_environment(),
-                working_dir=app_dir,
+                environment=environment,
+                working_dir=self._workload_config.app_dir,
                 user=self._workload_config.user,
                 group=self._workload_config.group,
             )
-        self._container.replan()
+        if is_layer_changed or not all(service.is_running() for service in services.values()):
+            self._container.replan()
 
 
 def map_integrations_to_env(integrations: IntegrationsState) -> dict[str, str]:
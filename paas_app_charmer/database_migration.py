@@ -35,7 +35,7 @@ class DatabaseMigration:
     def __init__(
         self,
         container: ops.Container,
-        state_dir: pathlib.Path,
+        state_dir: pathlib.PurePath,
     ):
         """Initialize the DatabaseMigration instance.
 
@@ -46,6 +46,8 @@ class DatabaseMigration:
         self._container = container
         self._status_file = state_dir / "database-migration-status"
         self._completed_script_file = state_dir / "completed-database-migration"
+        # Only this instance writes the status file, so it is read at most once.
+        self._status: DatabaseMigrationStatus | None = None
 
     def get_status(self) -> DatabaseMigrationStatus:
         """Get the database migration run status.
@@ -53,11 +55,15 @@ class DatabaseMigration:
         Returns:
             One of "PENDING", "COMPLETED", or "FAILED".
         """
-        return (
-            DatabaseMigrationStatus.PENDING
-            if not self._container.can_connect() or not self._container.exists(self._status_file)
-            else DatabaseMigrationStatus(cast(str, self._container.pull(self._status_file).read()))
-        )
+        if not self._container.can_connect():
+            return DatabaseMigrationStatus.PENDING
+        if self._status is None:
+            self._status = (
+                DatabaseMigrationStatus(cast(str, self._container.pull(self._status_file).read()))
+                if self._container.exists(self._status_file)
+                else DatabaseMigrationStatus.PENDING
+            )
+        return self._status
 
     def set_status_to_pending(self) -> None:
         """Set the database migration run status to pending."""
@@ -70,6 +76,7 @@ class DatabaseMigration:
             status: One of "PENDING", "COMPLETED", or "FAILED".
         """
         self._container.push(self._status_file, source=status, make_dirs=True)
+        self._status = status
 
     # disable the too-many-arguments check because it's a wrapper around `ops.Container.exec`
     # pylint: disable=too-many-arguments
@@ -77,7 +84,7 @@ class DatabaseMigration:
         self,
         command: list[str],
         environment: dict[str, str],
-        working_dir: pathlib.Path,
+        working_dir: pathlib.PurePath,
         user: str | None = None,
         group: str | None = None,
     ) -> None:
@@ -21,7 +21,8 @@ async def test_db_migration(
     arrange: build and deploy the flask charm.
     act: deploy the database and relate it to the charm.
     assert: requesting the charm should return a correct response indicate
-        the database migration script has been executed and only executed once.
+        the database migration script has been executed and only executed once, and
+        passwords bcrypt can't hash should be rejected.
     """
     db_app = await model.deploy("postgresql-k8s", channel="14/stable", trust=True)
     await model.wait_for_idle()
@@ -39,3 +40,9 @@ async def test_db_migration(
             f"http://{unit_ip}:8000/users", json=user_creation_request, timeout=5
         )
         assert response.status_code == 400
+        response = requests.post(
+            f"http://{unit_ip}:8000/users",
+            json={"username": "baz", "password": "x" * 73},
+            timeout=5,
+        )
+        assert response.status_code == 400
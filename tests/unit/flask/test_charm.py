@@ -100,6 +100,95 @@ def test_rotate_secret_key_action(harness: Harness):
     assert secret_key != new_secret_key
 
 
+def test_charm_state_built_once_per_event(harness: Harness, monkeypatch):
+    """
+    arrange: start the flask charm with the flask-app container ready.
+    act: update the charm configuration.
+    assert: the charm state is built only once for the config-changed event and the new
+        configuration reaches the flask service.
+    """
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+    from_charm_mock = unittest.mock.MagicMock(wraps=CharmState.from_charm)
+    monkeypatch.setattr(CharmState, "from_charm", from_charm_mock)
+
+    harness.update_config({"flask-env": "testing"})
+
+    assert from_charm_mock.call_count == 1
+    assert harness.charm._charm_state_cache is None
+    assert harness.model.unit.status == ops.ActiveStatus()
+    assert container.get_plan().services["flask"].environment["FLASK_ENV"] == "testing"
+
+
+def test_wsgi_config_validated_once_per_config(harness: Harness, monkeypatch):
+    """
+    arrange: start the flask charm with the flask-app container ready.
+    act: emit events without changing the configuration, then update the configuration.
+    assert: the flask configuration is only validated again when the configuration changed.
+    """
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+    get_wsgi_config_mock = unittest.mock.MagicMock(wraps=harness.charm.get_wsgi_config)
+    monkeypatch.setattr(harness.charm, "get_wsgi_config", get_wsgi_config_mock)
+
+    harness.charm.on.update_status.emit()
+    harness.charm.on.config_changed.emit()
+    assert get_wsgi_config_mock.call_count == 0
+
+    harness.update_config({"flask-env": "testing"})
+    harness.charm.on.update_status.emit()
+    assert get_wsgi_config_mock.call_count == 1
+    assert container.get_plan().services["flask"].environment["FLASK_ENV"] == "testing"
+
+
+def test_restart_skipped_when_unchanged(harness: Harness, monkeypatch):
+    """
+    arrange: start the flask charm with the flask-app container ready.
+    act: restart the charm without changes, change the configuration, then stop the service and
+        emit pebble-ready.
+    assert: the service is only replanned when the configuration changed or the service stopped.
+    """
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+    replan_mock = unittest.mock.MagicMock(wraps=container.replan)
+    monkeypatch.setattr(container, "replan", replan_mock)
+
+    harness.charm.restart()
+    assert replan_mock.call_count == 0
+    assert harness.model.unit.status == ops.ActiveStatus()
+
+    harness.update_config({"flask-env": "testing"})
+    assert replan_mock.call_count == 1
+
+    container.stop("flask")
+    harness.container_pebble_ready(FLASK_CONTAINER_NAME)
+    assert replan_mock.call_count == 2
+    assert container.get_service("flask").is_running()
+
+
+def test_wsgi_app_restart_unchanged_layer(harness: Harness, monkeypatch):
+    """
+    arrange: start the flask charm with the flask-app container ready.
+    act: restart the WSGI application again with the same charm state.
+    assert: the pebble layer is neither added nor replanned since it did not change.
+    """
+    container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("a_layer", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+    add_layer_mock = unittest.mock.MagicMock(wraps=container.add_layer)
+    monkeypatch.setattr(container, "add_layer", add_layer_mock)
+    replan_mock = unittest.mock.MagicMock(wraps=container.replan)
+    monkeypatch.setattr(container, "replan", replan_mock)
+
+    harness.charm._build_wsgi_app().restart()
+
+    assert add_layer_mock.call_count == 0
+    assert replan_mock.call_count == 0
+
+
 def test_integrations_wiring(harness: Harness):
     """
     arrange: Prepare a Redis a database and a S3 integration
@@ -179,6 +268,20 @@ def test_missing_integrations(harness: Harness, integrate_to, required_integrati
         assert integration not in harness.model.unit.status.message
 
 
+def test_required_integrations_only_managed_ones(harness: Harness):
+    """
+    arrange: Prepare the harness with the default metadata, where ingress and logging are not
+        optional and all the other integrations are.
+    act: Instantiate the charm.
+    assert: No integration should be required, since the charm doesn't wait for ingress or
+        logging.
+    """
+    harness.begin()
+    assert not harness.framework.meta.requires["ingress"].optional
+    assert harness.charm._required_integrations == frozenset()
+    assert harness.charm._missing_required_integrations(harness.charm._build_charm_state()) == []
+
+
 def test_missing_required_integration_stops_all_and_sets_migration_to_pending(harness: Harness):
     """
     arrange: Prepare the harness. Instantiate the charm with all the required integrations
@@ -2,11 +2,13 @@
 # See LICENSE file for licensing details.
 
 """Flask charm state unit tests."""
+
 import copy
 import unittest.mock
 from secrets import token_hex
 
 import pytest
+from pydantic import ValidationError
 
 from paas_app_charmer._gunicorn.charm_state import CharmState, S3Parameters
 from paas_app_charmer.exceptions import CharmConfigInvalidError
@@ -61,6 +63,28 @@ def test_charm_state_flask_config(charm_config: dict, flask_config: dict) -> Non
     assert charm_state.wsgi_config == flask_config
 
 
+def test_charm_state_app_config() -> None:
+    """
+    arrange: none
+    act: set user-defined charm configurations next to flask_* and webserver_* ones.
+    assert: app_config should only contain user-defined configurations not shadowing the
+        flask configurations.
+    """
+    config = copy.copy(DEFAULT_CHARM_CONFIG)
+    config.update(
+        {"flask-foo": "1", "foo": "2", "secret-key": "3", "webserver-workers": 4, "bar-baz": "5"}
+    )
+    charm = unittest.mock.MagicMock(config=config)
+    charm_state = CharmState.from_charm(
+        framework="flask",
+        wsgi_config=Charm.get_wsgi_config(charm),
+        secret_storage=SECRET_STORAGE_MOCK,
+        charm=charm,
+        database_requirers={},
+    )
+    assert charm_state.app_config == {"bar_baz": "5"}
+
+
 @pytest.mark.parametrize(
     "charm_config",
     [
@@ -264,3 +288,22 @@ def test_saml_integration_invalid(saml_app_relation_data, error_messages):
         )
     for message in error_messages:
         assert message in str(exc)
+
+
+@pytest.mark.parametrize(
+    "env_name",
+    [
+        pytest.param("JUJU_CHARM_HTTP_PROXY", id="http_proxy"),
+        pytest.param("JUJU_CHARM_HTTPS_PROXY", id="https_proxy"),
+    ],
+)
+def test_proxy_invalid(monkeypatch, env_name):
+    """
+    arrange: set a juju charm proxy environment variable that is not an http(s) URL.
+    act: read the proxy information from the charm state.
+    assert: It should raise a pydantic ValidationError.
+    """
+    monkeypatch.setenv(env_name, "proxy.test")
+    charm_state = CharmState(framework="flask", is_secret_storage_ready=True)
+    with pytest.raises(ValidationError):
+        _ = charm_state.proxy
@@ -3,6 +3,7 @@
 
 """Unit tests for Flask charm database integration."""
 import pathlib
+import unittest.mock
 
 import ops
 import pytest
@@ -85,15 +86,18 @@ def test_database_migration(harness: Harness):
 
 
 @pytest.mark.parametrize(
-    "file,command",
+    "files,command",
     [
-        pytest.param("migrate", ["/flask/app/migrate"], id="executable"),
-        pytest.param("migrate.sh", ["bash", "-eo", "pipefail", "migrate.sh"], id="shell"),
-        pytest.param("migrate.py", ["python3", "migrate.py"], id="python"),
-        pytest.param("manage.py", ["python3", "manage.py", "migrate"], id="django"),
+        pytest.param(["migrate"], ["/flask/app/migrate"], id="executable"),
+        pytest.param(["migrate.sh"], ["bash", "-eo", "pipefail", "migrate.sh"], id="shell"),
+        pytest.param(["migrate.py"], ["python3", "migrate.py"], id="python"),
+        pytest.param(["manage.py"], ["python3", "manage.py", "migrate"], id="django"),
+        pytest.param(
+            ["migrate", "migrate.sh", "migrate.py"], ["python3", "migrate.py"], id="precedence"
+        ),
     ],
 )
-def test_database_migrate_command(harness: Harness, file: str, command: list[str]):
+def test_database_migrate_command(harness: Harness, files: list[str], command: list[str]):
     """
     arrange: set up the test harness
     act: run the database migration with different database migration scripts
@@ -103,7 +107,8 @@ def test_database_migrate_command(harness: Harness, file: str, command: list[str
     container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
     container.add_layer("default", DEFAULT_LAYER)
     root = harness.get_filesystem_root(container)
-    (root / "flask/app" / file).touch()
+    for file in files:
+        (root / "flask/app" / file).touch()
     harness.set_can_connect(container, True)
     charm_state = CharmState(
         framework="flask",
@@ -159,3 +164,23 @@ def test_database_migration_status(harness: Harness):
     harness.handle_exec(container, [], result=0)
     database_migration.run(["migrate"], {}, pathlib.Path("/flask/app"))
     assert database_migration.get_status() == DatabaseMigrationStatus.COMPLETED
+
+
+def test_database_migration_status_read_once(harness: Harness, monkeypatch):
+    """
+    arrange: set up the test harness with a completed database migration status file.
+    act: get the database migration status twice.
+    assert: the status file is only read from the container once.
+    """
+    harness.begin()
+    container = harness.charm.unit.get_container(FLASK_CONTAINER_NAME)
+    container.push("/flask/state/database-migration-status", "COMPLETED", make_dirs=True)
+    pull_mock = unittest.mock.MagicMock(wraps=container.pull)
+    monkeypatch.setattr(container, "pull", pull_mock)
+    database_migration = DatabaseMigration(
+        container=container, state_dir=pathlib.Path("/flask/state")
+    )
+
+    assert database_migration.get_status() == DatabaseMigrationStatus.COMPLETED
+    assert database_migration.get_status() == DatabaseMigrationStatus.COMPLETED
+    assert pull_mock.call_count == 1
@@ -31,8 +31,10 @@ def test_flask_env(flask_config: dict, app_config: dict, database_migration_mock
     """
     arrange: create the Flask app object with a controlled charm state.
     act: none.
-    assert: flask_environment generated by the Flask app object should be acceptable by Flask app.
+    assert: flask_environment generated by the Flask app object should be acceptable by Flask app,
+        and the user-defined configuration in the charm state should be left untouched.
     """
+    original_app_config = dict(app_config)
     charm_state = CharmState(
         framework="flask",
         secret_key="foobar",
@@ -57,6 +59,7 @@ def test_flask_env(flask_config: dict, app_config: dict, database_migration_mock
         f"FLASK_{k.upper()}": v if isinstance(v, str) else json.dumps(v)
         for k, v in flask_config.items()
     }
+    assert charm_state.app_config == original_app_config
 
 
 HTTP_PROXY_TEST_PARAMS = [
@@ -6,6 +6,7 @@
 # this is a unit test file
 # pylint: disable=protected-access
 
+import shlex
 import textwrap
 import unittest.mock
 
@@ -17,6 +18,7 @@ from paas_app_charmer._gunicorn.charm_state import CharmState
 from paas_app_charmer._gunicorn.webserver import GunicornWebserver, WebserverConfig
 from paas_app_charmer._gunicorn.workload_config import WorkloadConfig
 from paas_app_charmer._gunicorn.wsgi_app import WsgiApp
+from paas_app_charmer.exceptions import CharmConfigInvalidError
 
 from .constants import DEFAULT_LAYER, FLASK_CONTAINER_NAME
 
@@ -49,6 +51,20 @@ GUNICORN_CONFIG_TEST_PARAMS = [
         ),
         id="threads=2,timeout=3,keepalive=4",
     ),
+    pytest.param(
+        {"threads": 4, "worker_class": "gthread"},
+        textwrap.dedent(
+            f"""\
+                bind = ['0.0.0.0:8000']
+                chdir = '/flask/app'
+                accesslog = '/var/log/flask/access.log'
+                errorlog = '/var/log/flask/error.log'
+                statsd_host = 'localhost:9125'
+                threads = 4
+                worker_class = 'gthread'"""
+        ),
+        id="threads=4,worker_class=gthread",
+    ),
 ]
 
 
@@ -100,8 +116,8 @@ def test_gunicorn_config(
 @pytest.mark.parametrize("is_running", [True, False])
 def test_webserver_reload(monkeypatch, harness: Harness, is_running, database_migration_mock):
     """
-    arrange: put an empty file in the Flask container and create a webserver object with default
-        charm state.
+    arrange: create a webserver object with default charm state and replace the gunicorn
+        configuration file with an empty one.
     act: run the update_config method of the webserver object with different server running status.
     assert: webserver object should send signal to the Gunicorn server based on the running status.
     """
@@ -110,7 +126,6 @@ def test_webserver_reload(monkeypatch, harness: Harness, is_running, database_mi
     harness.set_can_connect(container, True)
     container.add_layer("default", DEFAULT_LAYER)
 
-    container.push(f"/flask/gunicorn.conf.py", "")
     charm_state = CharmState(
         framework="flask",
         secret_key="",
@@ -133,6 +148,7 @@ def test_webserver_reload(monkeypatch, harness: Harness, is_running, database_mi
         database_migration=database_migration_mock,
     )
     flask_app.restart()
+    container.push(f"/flask/gunicorn.conf.py", "")
     send_signal_mock = unittest.mock.MagicMock()
     monkeypatch.setattr(container, "send_signal", send_signal_mock)
     webserver.update_config(
@@ -141,3 +157,175 @@ def test_webserver_reload(monkeypatch, harness: Harness, is_running, database_mi
         command=DEFAULT_LAYER["services"]["flask"]["command"],
     )
     assert send_signal_mock.call_count == (1 if is_running else 0)
+
+
+def test_webserver_config_unchanged(monkeypatch, harness: Harness, database_migration_mock):
+    """
+    arrange: start the Flask application with the default charm state.
+    act: run the update_config method of the webserver object again with the same configuration.
+    assert: the configuration file should not be pushed or checked again, and the webserver
+        should not be reloaded.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    harness.set_can_connect(container, True)
+    container.add_layer("default", DEFAULT_LAYER)
+    charm_state = CharmState(
+        framework="flask",
+        secret_key="",
+        is_secret_storage_ready=True,
+    )
+    workload_config = WorkloadConfig(
+        framework="flask",
+    )
+    webserver = GunicornWebserver(
+        webserver_config=WebserverConfig(),
+        workload_config=workload_config,
+        container=container,
+    )
+    flask_app = WsgiApp(
+        container=container,
+        charm_state=charm_state,
+        workload_config=workload_config,
+        webserver=webserver,
+        database_migration=database_migration_mock,
+    )
+    flask_app.restart()
+    push_mock = unittest.mock.MagicMock()
+    exec_mock = unittest.mock.MagicMock()
+    send_signal_mock = unittest.mock.MagicMock()
+    monkeypatch.setattr(container, "push", push_mock)
+    monkeypatch.setattr(container, "exec", exec_mock)
+    monkeypatch.setattr(container, "send_signal", send_signal_mock)
+    webserver.update_config(
+        is_webserver_running=True,
+        environment=flask_app.gen_environment(),
+        command=DEFAULT_LAYER["services"]["flask"]["command"],
+        is_environment_changed=False,
+    )
+    push_mock.assert_not_called()
+    exec_mock.assert_not_called()
+    send_signal_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "webserver_config, is_environment_changed",
+    [
+        pytest.param(WebserverConfig(workers=2), False, id="config changed"),
+        pytest.param(WebserverConfig(), True, id="environment changed"),
+    ],
+)
+def test_webserver_config_check_failed(
+    harness: Harness, database_migration_mock, webserver_config, is_environment_changed
+):
+    """
+    arrange: start the Flask application with the default charm state, then make the gunicorn
+        configuration check fail.
+    act: run the update_config method of a webserver object with a changed configuration or
+        environment twice.
+    assert: the check should fail both times and the previous configuration file should be kept.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    charm_state = CharmState(
+        framework="flask",
+        secret_key="",
+        is_secret_storage_ready=True,
+    )
+    workload_config = WorkloadConfig(
+        framework="flask",
+    )
+    flask_app = WsgiApp(
+        container=container,
+        charm_state=charm_state,
+        workload_config=workload_config,
+        webserver=GunicornWebserver(
+            webserver_config=WebserverConfig(),
+            workload_config=workload_config,
+            container=container,
+        ),
+        database_migration=database_migration_mock,
+    )
+    flask_app.restart()
+    valid_config = container.pull("/flask/gunicorn.conf.py").read()
+    harness.handle_exec(
+        FLASK_CONTAINER_NAME,
+        [*shlex.split(DEFAULT_LAYER["services"]["flask"]["command"]), "--check-config"],
+        result=1,
+    )
+    webserver = GunicornWebserver(
+        webserver_config=webserver_config,
+        workload_config=workload_config,
+        container=container,
+    )
+
+    for _ in range(2):
+        with pytest.raises(CharmConfigInvalidError):
+            webserver.update_config(
+                is_webserver_running=True,
+                environment=flask_app.gen_environment(),
+                command=DEFAULT_LAYER["services"]["flask"]["command"],
+                is_environment_changed=is_environment_changed,
+            )
+        assert container.pull("/flask/gunicorn.conf.py").read() == valid_config
+
+
+def test_wsgi_app_restart_check_failed(harness: Harness, database_migration_mock):
+    """
+    arrange: make the gunicorn configuration check fail.
+    act: restart the Flask application twice.
+    assert: both restarts should fail without adding the new layer or leaving a configuration
+        file behind.
+    """
+    harness.begin()
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    harness.handle_exec(
+        FLASK_CONTAINER_NAME,
+        [*shlex.split(DEFAULT_LAYER["services"]["flask"]["command"]), "--check-config"],
+        result=1,
+    )
+    workload_config = WorkloadConfig(
+        framework="flask",
+    )
+    flask_app = WsgiApp(
+        container=container,
+        charm_state=CharmState(
+            framework="flask",
+            secret_key="",
+            is_secret_storage_ready=True,
+        ),
+        workload_config=workload_config,
+        webserver=GunicornWebserver(
+            webserver_config=WebserverConfig(),
+            workload_config=workload_config,
+            container=container,
+        ),
+        database_migration=database_migration_mock,
+    )
+
+    for _ in range(2):
+        with pytest.raises(CharmConfigInvalidError):
+            flask_app.restart()
+        assert not container.exists("/flask/gunicorn.conf.py")
+        assert "environment" not in container.get_plan().services["flask"].to_dict()
+
+
+def test_webserver_worker_class_config(harness: Harness):
+    """
+    arrange: start the flask charm with the flask-app container ready.
+    act: set the webserver-worker-class charm configuration.
+    assert: the worker class should be read from the charm configuration and rendered in the
+        gunicorn configuration file pushed to the container.
+    """
+    container: ops.Container = harness.model.unit.get_container(FLASK_CONTAINER_NAME)
+    container.add_layer("default", DEFAULT_LAYER)
+    harness.begin_with_initial_hooks()
+    assert "worker_class" not in container.pull("/flask/gunicorn.conf.py").read()
+
+    harness.update_config({"webserver-worker-class": "gthread"})
+
+    assert WebserverConfig.from_charm(harness.charm).worker_class == "gthread"
+    config_lines = container.pull("/flask/gunicorn.conf.py").read().splitlines()
+    assert "worker_class = 'gthread'" in config_lines